@@ -9,15 +9,15 @@ bl_info = {
 }
 
 import bpy
-import bmesh
 from bpy_extras.io_utils import ExportHelper
 from bpy.props import StringProperty, BoolProperty, FloatProperty, IntProperty
 from bpy.types import Operator, Panel
 import os
-from xml.etree import ElementTree
-from xml.dom import minidom
-from mathutils import Vector
+import re
+from xml.sax.saxutils import quoteattr
 from math import pi
+from functools import lru_cache
+import numpy as np
 
 
 def to_hex(ch):
@@ -34,11 +34,178 @@ def col_to_hex(col):
     return '#' + ''.join(to_hex(ch) for ch in col[:3])  # Only RGB, ignore alpha
 
 
-def pretty_xml(elem):
-    """Returns a pretty-printed XML string for the Element"""
-    rough_string = ElementTree.tostring(elem, 'unicode')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent='  ')
+def points_to_world(points, attr, width, matrix):
+    """Reads a point attribute in bulk and transforms it to world coordinates"""
+    count = len(points)
+    buf = np.empty(count * width, dtype=np.float32)
+    points.foreach_get(attr, buf)
+    local = buf.reshape(count, width)[:, :3]
+    # Transform in double precision so rounding to high precision stays exact
+    mat = np.asarray(matrix, dtype=np.float64)
+    return local @ mat[:3, :3].T + mat[:3, 3]
+
+
+def bezier_segment_ends(spline, count):
+    """End point index of each bezier segment, cyclic splines wrap back to the first point"""
+    cyclic = spline.use_cyclic_u and count > 2
+    return np.arange(1, count + 1 if cyclic else count) % count
+
+
+def bezier_extrema(p0, p1, p2, p3):
+    """Points where cubic bezier segments turn around along any axis
+    
+    Takes (N, D) arrays of segment start, handles and end, and returns the
+    curve points at every root of the derivative inside (0, 1). Segments
+    without such a root contribute their start point instead.
+    """
+    # The derivative divided by 3 is a t^2 + b t + c, per axis
+    a = 3 * (p1 - p2) + p3 - p0
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Numerically stable quadratic roots, also covers a == 0
+        q = -0.5 * (b + np.copysign(np.sqrt(b * b - 4 * a * c), b))
+        roots = np.concatenate((q / a, c / q), axis=1)
+    t = np.where((roots > 0) & (roots < 1), roots, 0.0)[:, :, np.newaxis]
+    mt = 1 - t
+    points = (mt ** 3 * p0[:, np.newaxis] + 3 * mt * mt * t * p1[:, np.newaxis]
+              + 3 * mt * t * t * p2[:, np.newaxis] + t ** 3 * p3[:, np.newaxis])
+    return points.reshape(-1, p0.shape[1])
+
+
+# Trailing zeros of a space-terminated number. Every number carries the
+# same decimals, so the run never reaches past the decimal point
+TRAILING_ZEROS_RE = re.compile(r'0+(?= )')
+
+
+# Styling set on the main group and inherited by every path
+DEFAULT_FILL = "none"
+DEFAULT_STROKE = "#000000"
+
+# Widest formatted number: sign, 16 integer digits, point, 10 decimals, separator
+MAX_NUMBER_WIDTH = 32
+
+
+def format_path_ascii(rows, command, precision, sep, trim, out):
+    """Writes rows as ASCII path commands into out, returns the length used"""
+    scale = 10 ** precision
+    digits = np.empty(20, dtype=np.uint8)
+    n = 0
+    for i in range(rows.shape[0]):
+        if i > 0:
+            out[n] = 32  # ' '
+            n += 1
+        out[n] = command
+        out[n + 1] = 32
+        n += 2
+        for j in range(rows.shape[1]):
+            if j > 0:
+                out[n] = sep if j % 2 else 32
+                n += 1
+            
+            # Fixed point value, split into integer and decimal parts
+            value = np.int64(np.round(rows[i, j] * scale))
+            if value < 0:
+                out[n] = 45  # '-'
+                n += 1
+                value = -value
+            whole = value // scale
+            frac = value % scale
+            frac_digits = precision
+            if trim:
+                while frac_digits > 0 and frac % 10 == 0:
+                    frac //= 10
+                    frac_digits -= 1
+            
+            # Integer digits, skipping a lone leading zero when trimming
+            if not (trim and whole == 0 and frac_digits > 0):
+                count = 0
+                while True:
+                    digits[count] = 48 + whole % 10
+                    count += 1
+                    whole //= 10
+                    if whole == 0:
+                        break
+                for k in range(count - 1, -1, -1):
+                    out[n] = digits[k]
+                    n += 1
+            
+            # Zero padded decimal digits
+            if frac_digits > 0:
+                out[n] = 46  # '.'
+                n += 1
+                for k in range(frac_digits - 1, -1, -1):
+                    out[n + k] = 48 + frac % 10
+                    frac //= 10
+                n += frac_digits
+    return n
+
+
+# Row count from which compiling the Numba formatter pays off
+NUMBA_MIN_ROWS = 5000
+
+_format_path = None
+_format_path_loaded = False
+
+
+def compiled_format_path():
+    """Returns format_path_ascii compiled with Numba, or None without Numba
+    
+    Numba is imported on first use only, to keep enabling the add-on fast.
+    """
+    global _format_path, _format_path_loaded
+    if not _format_path_loaded:
+        _format_path_loaded = True
+        try:
+            from numba import njit
+            _format_path = njit(cache=True)(format_path_ascii)
+        except Exception:
+            # Missing Numba, or one that can't compile or cache here
+            _format_path = None
+    return _format_path
+
+
+@lru_cache(maxsize=16)
+def command_template(command, pairs, precision, sep):
+    """Format string for one path command of pairs coordinate pairs"""
+    number = f"{{:.{precision}f}}"
+    return command + ' ' + ' '.join([number + sep + number] * pairs)
+
+
+def format_commands(command, rows, precision, minify=False):
+    """Formats each row of an (N, 2k) array as a path command with k coordinate pairs"""
+    global _format_path
+    if not len(rows):
+        return ''
+    sep = ' ' if minify else ','
+    
+    # Round once up front so both formatters print the same digits,
+    # adding 0.0 turns any -0.0 left by rounding into 0.0
+    rows = np.round(rows, precision) + 0.0
+    
+    # Compiled formatter for big blocks, as long as the fixed point values are exact in float64
+    if len(rows) >= NUMBA_MIN_ROWS and np.abs(rows).max() * 10 ** precision < 2 ** 53:
+        format_path = compiled_format_path()
+        if format_path is not None:
+            out = np.empty(len(rows) * (2 + rows.shape[1] * MAX_NUMBER_WIDTH), dtype=np.uint8)
+            try:
+                # Compilation happens on the first call and may still fail
+                size = format_path(rows, ord(command), precision, ord(sep), minify, out)
+            except Exception:
+                # Stop trying the compiled formatter for the rest of the session
+                _format_path = None
+            else:
+                return out[:size].tobytes().decode('ascii')
+    
+    # Repeat the row template for the whole block, filled in a single format call
+    row = command_template(command, rows.shape[1] // 2, precision, sep)
+    commands = ' '.join([row] * len(rows)).format(*rows.ravel().tolist())
+    if minify and precision > 0:
+        # Shortest form of each number, rounding already removed any -0.
+        # Only plain replacements, so the work stays in C
+        commands = TRAILING_ZEROS_RE.sub('', commands + ' ')
+        commands = commands.replace('. ', ' ').replace(' 0.', ' .').replace('-0.', '-.')[:-1]
+    return commands
 
 
 class EXPORT_OT_curve_svg(Operator, ExportHelper):
@@ -91,12 +258,25 @@ class EXPORT_OT_curve_svg(Operator, ExportHelper):
             self.report({'ERROR'}, "No 2D curve objects selected!")
             return {'CANCELLED'}
         
-        # Calculate bounding box in Blender units first
-        bbox_min = [float('inf'), float('inf')]
-        bbox_max = [float('-inf'), float('-inf')]
+        # Read every spline once in world coordinates, growing the
+        # bounding box (in Blender units) as we go
+        bbox_min = np.full(2, float('inf'))
+        bbox_max = np.full(2, float('-inf'))
         
+        depsgraph = context.evaluated_depsgraph_get()
+        curve_points = {}
         for obj in curve_objects:
-            self.update_bbox(bbox_min, bbox_max, obj)
+            matrix = np.asarray(obj.matrix_world, dtype=np.float64)
+            
+            # NURBS splines are taken from Blender's own evaluation of the curve
+            outlines = None
+            if any(spline.type == 'NURBS' for spline in obj.data.splines):
+                outlines = self.evaluated_outlines(obj, depsgraph, matrix)
+            
+            spline_points = [(spline, self.spline_world_points(spline, matrix, outlines[index] if outlines else None))
+                             for index, spline in enumerate(obj.data.splines)]
+            self.update_bbox(bbox_min, bbox_max, spline_points)
+            curve_points[obj] = spline_points
         
         if bbox_min[0] == float('inf'):
             self.report({'ERROR'}, "Could not calculate bounding box!")
@@ -123,235 +303,255 @@ class EXPORT_OT_curve_svg(Operator, ExportHelper):
         svg_x = bbox_min[0] * auto_scale
         svg_y = -bbox_max[1] * auto_scale  # Flip Y coordinate
         
-        # Create SVG root element with proper metadata
-        svg = ElementTree.Element('svg')
-        svg.set('xmlns', "http://www.w3.org/2000/svg")
-        svg.set('xmlns:xlink', "http://www.w3.org/1999/xlink")
-        svg.set('version', "1.1")
-        svg.set('x', "0px")
-        svg.set('y', "0px")
-        svg.set('width', f"{svg_width:.1f}px")
-        svg.set('height', f"{svg_height:.1f}px")
-        svg.set('viewBox', f"{svg_x:.1f} {svg_y:.1f} {svg_width:.1f} {svg_height:.1f}")
-        svg.set('xml:space', "preserve")
+        # SVG root element with proper metadata
+        svg_attributes = ' '.join([
+            'xmlns="http://www.w3.org/2000/svg"',
+            'xmlns:xlink="http://www.w3.org/1999/xlink"',
+            'version="1.1"',
+            'x="0px"',
+            'y="0px"',
+            f'width="{svg_width:.1f}px"',
+            f'height="{svg_height:.1f}px"',
+            f'viewBox="{svg_x:.1f} {svg_y:.1f} {svg_width:.1f} {svg_height:.1f}"',
+            'xml:space="preserve"',
+        ])
+        
+        # Hex colors by material pointer, shared between curves
+        self._mat_hex_cache = {}
+        
+        newline = '' if self.minify else '\n'
+        indent = '' if self.minify else '  '
         
-        svg.append(ElementTree.Comment(f" Generated by Blender {bpy.app.version_string} - Curve to SVG Exporter "))
+        # Build the whole document before touching the file, so a failure
+        # while generating paths never leaves a half-written SVG behind
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>' + newline]
+        if not self.minify:
+            parts.append('<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">\n')
+        parts.append(f'<svg {svg_attributes}>{newline}')
+        parts.append(f'{indent}<!-- Generated by Blender {bpy.app.version_string} - Curve to SVG Exporter -->{newline}')
         
-        # Main group container
-        main_group = ElementTree.SubElement(svg, 'g')
-        main_group.set('id', "blender-curves")
+        # Main group container, carrying the styling shared by all paths
+        stroke_width = max(1.0, 2.0 / auto_scale)  # Adaptive stroke width
+        parts.append(f'{indent}<g id="blender-curves" fill="{DEFAULT_FILL}" stroke="{DEFAULT_STROKE}" '
+                     f'stroke-width="{stroke_width:.2f}">{newline}')
         
         # Process each curve object with proper scaling
-        for obj in curve_objects:
-            path_element = self.curve_to_svg_path(obj, auto_scale)
+        for obj, spline_points in curve_points.items():
+            path_element = self.curve_to_svg_path(obj, spline_points, auto_scale)
             if path_element is not None:
-                main_group.append(path_element)
+                parts.append(f'{indent * 2}{path_element}{newline}')
+        
+        parts.append(f'{indent}</g>{newline}')
+        parts.append(f'</svg>{newline}')
         
         # Write SVG file
         try:
-            if self.minify:
-                svg_string = '<?xml version="1.0" encoding="UTF-8"?>' + ElementTree.tostring(svg, 'unicode')
-            else:
-                svg_string = '<?xml version="1.0" encoding="UTF-8"?>\n'
-                svg_string += '<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">\n'
-                svg_string += pretty_xml(svg).split('?>\n', 1)[1]  # Remove duplicate XML declaration
-            
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(svg_string)
-            
-            self.report({'INFO'}, f"Exported {len(curve_objects)} curves to {filepath} (scale: {auto_scale:.1f})")
-            return {'FINISHED'}
-            
+                f.writelines(parts)
         except Exception as e:
             self.report({'ERROR'}, f"Failed to write SVG file: {str(e)}")
             return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Exported {len(curve_objects)} curves to {filepath} (scale: {auto_scale:.1f})")
+        return {'FINISHED'}
     
-    def curve_to_svg_path(self, obj, scale_factor):
-        """Convert a curve object to SVG path element"""
+    def curve_to_svg_path(self, obj, spline_points, scale_factor):
+        """Convert a curve object's spline points to an SVG path element string"""
         curve_data = obj.data
         
-        # Collect all path data
-        path_commands = []
+        # Collect all path data, each spline adds at most a move,
+        # a block of curves or lines and a close
+        path_commands = [None] * (3 * len(spline_points))
+        count = 0
         
-        for spline in curve_data.splines:
-            spline_commands = self.spline_to_path_commands(spline, obj, scale_factor)
-            path_commands.extend(spline_commands)
+        for spline, world in spline_points:
+            count = self.spline_to_path_commands(spline, world, scale_factor, path_commands, count)
         
-        if not path_commands:
+        if not count:
             return None
         
-        # Create path element
-        path = ElementTree.Element('path')
-        path.set('id', obj.name)
-        path.set('d', ' '.join(path_commands))
-        
-        # Styling - cleaner approach
-        fill_color = "none"
-        stroke_color = "#000000"
-        stroke_width = max(1.0, 2.0 / scale_factor)  # Adaptive stroke width
+        # Styling is inherited from the main group unless a material overrides it
+        style = ''
         
         # Try to get color from material
         if self.include_fills and curve_data.materials:
             material = curve_data.materials[0]  # Use first material
-            if material and hasattr(material, 'diffuse_color'):
-                color_hex = col_to_hex(material.diffuse_color)
-                fill_color = color_hex
-                stroke_color = color_hex
-        
-        path.set('fill', fill_color)
-        path.set('stroke', stroke_color)
-        path.set('stroke-width', f"{stroke_width:.2f}")
+            if material:
+                key = material.as_pointer()
+                color_hex = self._mat_hex_cache.get(key)
+                if color_hex is None:
+                    color_hex = col_to_hex(material.diffuse_color)
+                    self._mat_hex_cache[key] = color_hex
+                style = f' fill="{color_hex}"'
+                if color_hex != DEFAULT_STROKE:
+                    style += f' stroke="{color_hex}"'
         
-        return path
+        # Create path element
+        path_data = ' '.join(path_commands[:count])
+        return f'<path id={quoteattr(obj.name)} d="{path_data}"{style}/>'
     
-    def spline_to_path_commands(self, spline, obj, scale_factor):
-        """Convert a spline to SVG path commands"""
-        commands = []
-        
-        # Apply object transformations to get world coordinates
-        matrix = obj.matrix_world
+    def spline_world_points(self, spline, matrix, outline=None):
+        """Read the points of a spline as arrays of world coordinates
         
+        Returns (co, handle_left, handle_right) for bezier splines and
+        a single array of points for poly and NURBS splines. NURBS splines
+        use their evaluated outline when one is given.
+        """
         if spline.type == 'BEZIER':
             points = spline.bezier_points
             if not points:
-                return commands
-            
-            # Move to first point
-            first_world = matrix @ points[0].co
-            first_svg = self.blender_to_svg_coords(first_world, scale_factor)
-            commands.append(f"M {first_svg[0]},{first_svg[1]}")
+                return ()
             
-            # Add curves for subsequent points
-            for i in range(1, len(points)):
-                prev_point = points[i-1]
-                curr_point = points[i]
-                
-                # Transform to world coordinates
-                h1_world = matrix @ prev_point.handle_right
-                h2_world = matrix @ curr_point.handle_left
-                p_world = matrix @ curr_point.co
-                
-                # Convert to SVG coordinates
-                h1_svg = self.blender_to_svg_coords(h1_world, scale_factor)
-                h2_svg = self.blender_to_svg_coords(h2_world, scale_factor)
-                p_svg = self.blender_to_svg_coords(p_world, scale_factor)
-                
-                commands.append(f"C {h1_svg[0]},{h1_svg[1]} {h2_svg[0]},{h2_svg[1]} {p_svg[0]},{p_svg[1]}")
+            # Read all control points at once in world coordinates
+            co = points_to_world(points, "co", 3, matrix)
+            handle_left = points_to_world(points, "handle_left", 3, matrix)
+            handle_right = points_to_world(points, "handle_right", 3, matrix)
+            return (co, handle_left, handle_right)
+        
+        elif spline.type in ('POLY', 'NURBS'):
+            if spline.type == 'NURBS' and outline is not None:
+                return (outline,)
             
-            # Close path if cyclic
-            if spline.use_cyclic_u and len(points) > 2:
-                # Connect last point back to first
-                last_point = points[-1]
-                first_point = points[0]
-                
-                h1_world = matrix @ last_point.handle_right
-                h2_world = matrix @ first_point.handle_left
-                p_world = matrix @ first_point.co
-                
-                h1_svg = self.blender_to_svg_coords(h1_world, scale_factor)
-                h2_svg = self.blender_to_svg_coords(h2_world, scale_factor)
-                p_svg = self.blender_to_svg_coords(p_world, scale_factor)
-                
-                commands.append(f"C {h1_svg[0]},{h1_svg[1]} {h2_svg[0]},{h2_svg[1]} {p_svg[0]},{p_svg[1]}")
-                commands.append("Z")
-        
-        elif spline.type == 'POLY':
+            # Fallback for NURBS is the control polygon
             points = spline.points
             if not points:
-                return commands
-            
-            # Move to first point
-            first_world = matrix @ Vector(points[0].co[:3])
-            first_svg = self.blender_to_svg_coords(first_world, scale_factor)
-            commands.append(f"M {first_svg[0]},{first_svg[1]}")
+                return ()
             
-            # Line to subsequent points
-            for i in range(1, len(points)):
-                p_world = matrix @ Vector(points[i].co[:3])
-                p_svg = self.blender_to_svg_coords(p_world, scale_factor)
-                commands.append(f"L {p_svg[0]},{p_svg[1]}")
+            # Points are stored as (x, y, z, w)
+            return (points_to_world(points, "co", 4, matrix),)
+        
+        return ()
+    
+    def evaluated_outlines(self, obj, depsgraph, matrix):
+        """Read the evaluated outline of each spline from the object's mesh
+        
+        Returns one array of world coordinates per spline, or None when the
+        evaluated mesh can't be matched up with the splines. Only unfilled
+        curves qualify: fills regroup vertices (open splines first, closed
+        ones by material), so runs no longer follow spline order.
+        """
+        eval_obj = obj.evaluated_get(depsgraph)
+        try:
+            mesh = eval_obj.to_mesh()
+        except RuntimeError:
+            return None
+        
+        try:
+            if len(mesh.polygons):
+                return None
+            world = points_to_world(mesh.vertices, "co", 3, matrix)
+            edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+            mesh.edges.foreach_get("vertices", edges)
+        finally:
+            eval_obj.to_mesh_clear()
+        
+        # Outlines are stored one after another, so a new one starts at
+        # every vertex that isn't joined to the vertex before it
+        edges = np.sort(edges.reshape(-1, 2), axis=1)
+        steps = edges[edges[:, 1] - edges[:, 0] == 1]
+        joined = np.zeros(len(world), dtype=bool)
+        joined[steps[:, 1]] = True
+        starts = np.flatnonzero(~joined)
+        
+        splines = obj.data.splines
+        if len(starts) != len(splines):
+            return None
+        outlines = np.split(world, starts[1:])
+        
+        # Make sure each NURBS spline really got its own outline
+        closing = {(int(a), int(b)) for a, b in edges[edges[:, 1] - edges[:, 0] > 1]}
+        ends = np.append(starts[1:], len(world)) - 1
+        for spline, outline, start, end in zip(splines, outlines, starts, ends):
+            if spline.type != 'NURBS':
+                continue
+            if spline.use_cyclic_u != ((int(start), int(end)) in closing):
+                return None
             
-            # Close if cyclic
-            if spline.use_cyclic_u:
-                commands.append("Z")
+            # The curve stays inside the bounds of its control points
+            co = points_to_world(spline.points, "co", 4, matrix)
+            tolerance = 1e-4 * max(1.0, float(np.abs(co).max()))
+            if (outline.min(axis=0) < co.min(axis=0) - tolerance).any() or \
+                    (outline.max(axis=0) > co.max(axis=0) + tolerance).any():
+                return None
         
-        elif spline.type == 'NURBS':
-            # Sample NURBS curves as line segments
-            points = spline.points
-            if not points:
-                return commands
+        return outlines
+    
+    def spline_to_path_commands(self, spline, world, scale_factor, commands, index):
+        """Write a spline's SVG path commands into commands from index on
+        
+        Returns the index after the last command written.
+        """
+        if not world:
+            return index
+        
+        if spline.type == 'BEZIER':
+            # Convert everything to SVG space up front
+            co, handle_left, handle_right = (self.blender_to_svg_coords(arr, scale_factor) for arr in world)
             
-            resolution = max(len(points) * 8, 32)  # Higher resolution for smoother curves
+            # Cyclic splines get one more segment connecting the last point
+            # back to the first, reusing the first point's converted values
+            following = bezier_segment_ends(spline, len(co))
+            count = len(following)
+            cyclic = count == len(co)
             
-            # Sample the curve using Blender's built-in evaluation if possible
-            try:
-                # Try to use Blender's curve evaluation
-                depsgraph = bpy.context.evaluated_depsgraph_get()
-                curve_eval = obj.evaluated_get(depsgraph)
-                
-                # Sample points along the curve
-                sample_points = []
-                for i in range(resolution + 1):
-                    t = i / resolution
-                    
-                    # This is simplified - for production use, you'd want proper NURBS evaluation
-                    # For now, we'll interpolate between control points
-                    if len(points) >= 2:
-                        if t == 0:
-                            world_point = matrix @ Vector(points[0].co[:3])
-                        elif t == 1:
-                            world_point = matrix @ Vector(points[-1].co[:3])
-                        else:
-                            # Linear interpolation between points
-                            idx = min(int(t * (len(points) - 1)), len(points) - 2)
-                            local_t = (t * (len(points) - 1)) - idx
-                            
-                            p1 = Vector(points[idx].co[:3])
-                            p2 = Vector(points[idx + 1].co[:3])
-                            interpolated = p1.lerp(p2, local_t)
-                            world_point = matrix @ interpolated
-                        
-                        svg_point = self.blender_to_svg_coords(world_point, scale_factor)
-                        sample_points.append(svg_point)
-                
-                if sample_points:
-                    commands.append(f"M {sample_points[0][0]},{sample_points[0][1]}")
-                    for point in sample_points[1:]:
-                        commands.append(f"L {point[0]},{point[1]}")
-                    
-                    if spline.use_cyclic_u:
-                        commands.append("Z")
+            # One row per curve segment: handle out, handle in, end point
+            segments = np.hstack((handle_right[:count], handle_left[following], co[following]))
+            
+            # Move to first point, then add curves for subsequent points
+            commands[index] = format_commands("M", co[:1], self.precision, self.minify)
+            index += 1
+            if len(segments):
+                commands[index] = format_commands("C", segments, self.precision, self.minify)
+                index += 1
+            
+            # Close path if cyclic
+            if cyclic:
+                commands[index] = "Z"
+                index += 1
+        
+        else:
+            # Poly lines and evaluated NURBS
+            co = self.blender_to_svg_coords(world[0], scale_factor)
             
-            except:
-                # Fallback to simple point sampling
-                if points:
-                    first_world = matrix @ Vector(points[0].co[:3])
-                    first_svg = self.blender_to_svg_coords(first_world, scale_factor)
-                    commands.append(f"M {first_svg[0]},{first_svg[1]}")
-                    
-                    for point in points[1:]:
-                        p_world = matrix @ Vector(point.co[:3])
-                        p_svg = self.blender_to_svg_coords(p_world, scale_factor)
-                        commands.append(f"L {p_svg[0]},{p_svg[1]}")
-        
-        return commands
+            # Move to first point, then line to subsequent points
+            commands[index] = format_commands("M", co[:1], self.precision, self.minify)
+            index += 1
+            if len(co) > 1:
+                commands[index] = format_commands("L", co[1:], self.precision, self.minify)
+                index += 1
+            
+            # Close if cyclic
+            if spline.use_cyclic_u:
+                commands[index] = "Z"
+                index += 1
+        
+        return index
     
-    def blender_to_svg_coords(self, world_point, scale_factor):
-        """Convert Blender world coordinates to SVG coordinates"""
-        # Apply scale and flip Y axis
-        x = round(world_point.x * scale_factor, self.precision)
-        y = round(-world_point.y * scale_factor, self.precision)  # Flip Y
-        return (x, y)
+    def blender_to_svg_coords(self, world_points, scale_factor):
+        """Convert an array of Blender world coordinates to SVG coordinates"""
+        # Apply scale and flip Y axis for all points at once, rounding
+        # to the export precision happens when the values are formatted
+        return world_points[:, :2] * (scale_factor, -scale_factor)
     
-    def update_bbox(self, bbox_min, bbox_max, obj):
-        """Update bounding box with object bounds"""
-        if hasattr(obj, 'bound_box'):
-            for corner in obj.bound_box:
-                world_corner = obj.matrix_world @ Vector(corner)
-                bbox_min[0] = min(bbox_min[0], world_corner.x)
-                bbox_min[1] = min(bbox_min[1], world_corner.y)
-                bbox_max[0] = max(bbox_max[0], world_corner.x)
-                bbox_max[1] = max(bbox_max[1], world_corner.y)
+    def update_bbox(self, bbox_min, bbox_max, spline_points):
+        """Update bounding box with an object's spline points"""
+        for spline, world in spline_points:
+            if not world:
+                continue
+            
+            if spline.type == 'BEZIER':
+                # The curve passes through its points but usually not its
+                # handles, so add where each segment bulges out instead
+                co, handle_left, handle_right = (arr[:, :2] for arr in world)
+                following = bezier_segment_ends(spline, len(co))
+                extrema = bezier_extrema(co[:len(following)], handle_right[:len(following)],
+                                         handle_left[following], co[following])
+                world_points = np.vstack((co, extrema))
+            else:
+                world_points = world[0][:, :2]
+            
+            np.minimum(bbox_min, world_points.min(axis=0), out=bbox_min)
+            np.maximum(bbox_max, world_points.max(axis=0), out=bbox_max)
 
 
 class VIEW3D_PT_curve_svg_export(Panel):
@@ -364,17 +564,18 @@ class VIEW3D_PT_curve_svg_export(Panel):
     
     def draw(self, context):
         layout = self.layout
+        selected_objects = context.selected_objects
         
         # Check if any 2D curves are selected
         curve_2d_selected = any(obj.type == 'CURVE' and obj.data.dimensions == '2D' 
-                               for obj in context.selected_objects)
+                               for obj in selected_objects)
         
         if curve_2d_selected:
             layout.operator("export_curve.svg", text="Export Selected Curves")
         else:
             layout.label(text="Select 2D curves to export", icon='INFO')
-            if context.selected_objects:
-                for obj in context.selected_objects:
+            if selected_objects:
+                for obj in selected_objects:
                     if obj.type == 'CURVE':
                         if obj.data.dimensions != '2D':
                             layout.label(text=f"{obj.name}: Not 2D", icon='ERROR')